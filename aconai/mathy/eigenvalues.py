@@ -1,21 +1,151 @@
 import numpy as np
-from numpy.linalg import qr
+from numpy.linalg import norm
 
-def _max_sub_diag(A: np.ndarray) -> float:
-    m = 0.0
-    n = A.shape[0]
-    for i in range(n):
-        for j in range(n):
-            if i > j and abs(A[i, j]) > m:
-                m = abs(A[i, j])
-    return m
+# QR steps allowed per eigenvalue before eig gives up, as in LAPACK.
+_MAX_STEPS_PER_EIGENVALUE = 30
+
+def _hessenberg(A: np.ndarray) -> np.ndarray:
+    """
+    Reduces A to upper Hessenberg form with Householder similarity
+    transformations, so the result has the same eigenvalues as A.
+    """
+    H = np.array(A, dtype=float)
+    n = H.shape[0]
+    for k in range(n - 2):
+        x = H[k + 1:, k]
+        alpha = norm(x)
+        if alpha == 0.0:
+            continue
+        v = x.copy()
+        v[0] += np.copysign(alpha, x[0])
+        v /= norm(v)
+        H[k + 1:, k:] -= 2.0 * np.outer(v, v @ H[k + 1:, k:])
+        H[:, k + 1:] -= 2.0 * np.outer(H[:, k + 1:] @ v, v)
+    return H
+
+def _qr_step(H: np.ndarray, mu: float = 0.0) -> np.ndarray:
+    """
+    Computes R @ Q + mu * I, where Q @ R is the QR decomposition of the
+    shifted upper Hessenberg matrix H - mu * I. Using Givens rotations, this
+    costs O(n^2) and the result is again upper Hessenberg.
+    """
+    n = H.shape[0]
+    H = H - mu * np.identity(n)
+    rotations = []
+    for k in range(n - 1):
+        r = np.hypot(H[k, k], H[k + 1, k])
+        if r == 0.0:
+            c, s = 1.0, 0.0
+        else:
+            c, s = H[k, k] / r, H[k + 1, k] / r
+        G = np.array([[c, s], [-s, c]])
+        H[k:k + 2, k:] = G @ H[k:k + 2, k:]
+        rotations.append(G)
+    for k, G in enumerate(rotations):
+        H[:k + 2, k:k + 2] = H[:k + 2, k:k + 2] @ G.T
+    H += mu * np.identity(n)
+    return H
+
+def _double_shift_step(H: np.ndarray) -> np.ndarray:
+    """
+    Performs one QR step shifted by both eigenvalues of the trailing 2x2
+    block of the upper Hessenberg matrix H, for when they are a complex
+    pair. Their characteristic polynomial p is real, so the step stays in
+    real arithmetic: with Q @ R the QR decomposition of p(H), this returns
+    Q.T @ H @ Q, which is upper Hessenberg up to rounding.
+    """
+    n = H.shape[0]
+    trace = H[-2, -2] + H[-1, -1]
+    det = H[-2, -2] * H[-1, -1] - H[-2, -1] * H[-1, -2]
+    Q, _ = np.linalg.qr(H @ H - trace * H + det * np.identity(n))
+    return np.triu(Q.T @ H @ Q, -1)
+
+def _trailing_discriminant(H: np.ndarray) -> tuple[float, float]:
+    """
+    Returns half the gap between the diagonal entries of the trailing 2x2
+    block of H, and the discriminant of that block's characteristic
+    polynomial, which is negative when its eigenvalues are complex.
+    """
+    a, b = H[-2, -2], H[-2, -1]
+    c, d = H[-1, -2], H[-1, -1]
+    half_gap = (a - d) / 2.0
+    return float(half_gap), float(half_gap * half_gap + b * c)
+
+def _wilkinson_shift(H: np.ndarray) -> float:
+    """
+    Returns the eigenvalue of the trailing 2x2 block of H closest to the last
+    diagonal entry. If that block has complex eigenvalues, this falls back to
+    the last diagonal entry.
+    """
+    b, c, d = H[-2, -1], H[-1, -2], H[-1, -1]
+    half_gap, disc = _trailing_discriminant(H)
+    if disc < 0.0:
+        return float(d)
+    denom = half_gap + np.copysign(np.sqrt(disc), half_gap)
+    if denom == 0.0:
+        return float(d)
+    return float(d - b * c / denom)
+
+def _complex_pair(H: np.ndarray) -> list[complex]:
+    """
+    Returns the complex conjugate eigenvalues of the 2x2 matrix H in closed
+    form. QR steps with real shifts cannot split such a block.
+    """
+    _, disc = _trailing_discriminant(H)
+    mean = (H[0, 0] + H[1, 1]) / 2.0
+    root = complex(0.0, np.sqrt(-disc))
+    return [mean + root, mean - root]
+
+def _split_index(H: np.ndarray, tol: float) -> int:
+    """
+    Returns the index k of the first negligible subdiagonal entry H[k, k - 1],
+    at which H decouples into two independent blocks, or 0 if there is none.
+    An entry is negligible when it is at most tol times the larger of its
+    adjacent diagonal magnitudes and the norm of H, so that blocks whose
+    diagonal is tiny can still decouple.
+    """
+    sub = np.abs(np.diagonal(H, offset=-1))
+    diag = np.abs(np.diagonal(H))
+    scale = np.maximum(diag[:-1] + diag[1:], norm(H))
+    negligible = sub <= tol * scale
+    k = int(np.argmax(negligible))
+    return k + 1 if negligible[k] else 0
 
 def eig(A: np.ndarray, tol: float = 1e-6) -> np.ndarray:
+    """
+    Computes the eigenvalues of A with the shifted QR algorithm, returned in
+    order of decreasing magnitude. The result is complex if A has complex
+    eigenvalues. tol is relative: a subdiagonal entry is treated as zero once
+    it is at most tol times the scale of the surrounding block. Raises
+    numpy.linalg.LinAlgError if the iteration does not converge.
+    """
     if len(A.shape) != 2 or A.shape[0] != A.shape[1]:
         raise ValueError("A must be a square matrix")
-    while _max_sub_diag(A) > tol:
-        res = qr(A)
-        Q = res.Q
-        R  = res.R
-        A = R @ Q
-    return np.diagonal(A)
\ No newline at end of file
+    if np.iscomplexobj(A):
+        raise ValueError("A must be a real matrix")
+    blocks = [_hessenberg(A)]
+    lambdas: list[float | complex] = []
+    steps_left = _MAX_STEPS_PER_EIGENVALUE * A.shape[0]
+    while blocks:
+        H = blocks.pop()
+        if H.shape[0] <= 1:
+            lambdas.extend(np.diagonal(H))
+            continue
+        k = _split_index(H, tol)
+        if k:
+            blocks.append(H[:k, :k])
+            blocks.append(H[k:, k:])
+        elif H.shape[0] == 2 and _trailing_discriminant(H)[1] < 0.0:
+            lambdas.extend(_complex_pair(H))
+        elif steps_left == 0:
+            raise np.linalg.LinAlgError(
+                "eig did not converge; try a larger tol"
+            )
+        elif _trailing_discriminant(H)[1] < 0.0:
+            steps_left -= 1
+            blocks.append(_double_shift_step(H))
+        else:
+            steps_left -= 1
+            blocks.append(_qr_step(H, _wilkinson_shift(H)))
+    result = np.array(lambdas)
+    return result[np.argsort(-np.abs(result), kind="stable")]
@@ -1,5 +1,4 @@
 import numpy as np
-from numpy.linalg import norm
 
 def qr(A: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     if len(A.shape) != 2:
@@ -7,13 +6,11 @@ def qr(A: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     m, n = A.shape
     if m < n:
         raise ValueError("Matrix has fewer rows than columns")
-    Q = np.zeros((m, n))
-    R = np.zeros((n, n))
-    for k in range(n):
-        v = A[:, k]
-        for j in range(k):
-            R[j, k] = np.dot(Q[:, j], v)
-            v = v - R[j, k] * Q[:, j]
-        R[k, k] = norm(v)
-        Q[:, k] = v / R[k, k]
-    return (Q, R)
\ No newline at end of file
+    Q, R = np.linalg.qr(A, mode="reduced")
+    # LAPACK's Householder QR does not fix the signs of the diagonal of R.
+    # Flip them so R has a non-negative diagonal, matching Gram-Schmidt.
+    S = np.sign(np.diag(R))
+    S[S == 0] = 1.0
+    R *= S[:, None]
+    Q *= S[None, :]
+    return (Q, R)
@@ -1,9 +1,8 @@
 import json
-from typing import Generic, Iterable, TypeVar, final
+from typing import Generic, Iterable, Iterator, Optional, TypeVar, cast, final
 from aconai.pipelines.data_registry import DataRegistry
-from avro.schema import parse
-from avro.datafile import DataFileReader, DataFileWriter
-from avro.io import DatumReader, DatumWriter
+from avro.schema import Schema, parse
+import fastavro
 from abc import ABC, abstractmethod
 
 T = TypeVar("T")
@@ -19,6 +18,40 @@ class DataProvider(ABC, Generic[T]):
 
     def __init__(self, registry: DataRegistry) -> None:        
         self.registry = registry
+        self._schema: Optional[Schema] = None
+        self._writer_schema: Optional[dict] = None
+
+    def _parsed_schema(self) -> Schema:
+        """
+        Returns the parsed avro schema for get_schema(), used to validate the
+        schema against the registry. The schema is parsed on first use and
+        reused for subsequent reads.
+        """
+        if self._schema is None:
+            self._schema = parse(json.dumps(self.get_schema()))
+        return self._schema
+
+    def _parsed_writer_schema(self) -> dict:
+        """
+        Returns the fastavro parsed form of get_schema(), used to write the
+        data files. The schema is parsed on first use and reused for
+        subsequent writes.
+        """
+        if self._writer_schema is None:
+            self._writer_schema = cast(
+                dict, fastavro.parse_schema(self.get_schema())
+            )
+        return self._writer_schema
+
+    def _read_records(self, file_name: str) -> Iterator[T]:
+        """
+        Reads the records from the given data file, converting each one with
+        record_as_type(). The file is closed once the records are exhausted.
+        """
+        with open(file_name, "rb") as fo:
+            for record in fastavro.reader(fo):
+                assert isinstance(record, dict)
+                yield self.record_as_type(record)
 
     @final
     def cached_read(self) -> Iterable[T]:
@@ -28,22 +61,33 @@ class DataProvider(ABC, Generic[T]):
         retrieved by delegating to the get_records() method, and stroring the
         data in the cache.
         """
-        schema = parse(json.dumps(self.get_schema()))
-        registered_file = self.registry.register(
-            self.registry_key(), schema, self.get_parameters()
-        )
-        file_name = registered_file.file_name
-        if not registered_file.is_marked_written:
-            writer = DataFileWriter(open(file_name, "wb"), DatumWriter(), schema)
-            for record in self.get_records():
-                writer.append(record)
-            writer.close()
-            self.registry.mark_written(self.registry_key(), file_name)       
-        reader = DataFileReader(open(file_name, "rb"), DatumReader())
-        def f(x: object) -> T:
-            assert isinstance(x, dict)
-            return self.record_as_type(x)
-        return map(f, reader)
+        schema = self._parsed_schema()
+        key = self.registry_key()
+        with self.registry.batch():
+            registered_file = self.registry.register(
+                key, schema, self.get_parameters()
+            )
+            file_name = registered_file.file_name
+            if not registered_file.is_marked_written:
+                if self.registry.inmemory:
+                    self.registry.store_records(
+                        file_name, list(self.get_records())
+                    )
+                else:
+                    with open(file_name, "wb") as fo:
+                        fastavro.writer(
+                            fo,
+                            self._parsed_writer_schema(),
+                            self.get_records(),
+                            codec=self.get_codec(),
+                        )
+                self.registry.mark_written(key, file_name)
+        if self.registry.inmemory:
+            # Records are served as get_records() produced them, without an
+            # avro round trip.
+            return map(self.record_as_type,
+                       self.registry.stored_records(file_name))
+        return self._read_records(file_name)
     
     def registry_key(self) -> str:
         """
@@ -61,6 +105,15 @@ class DataProvider(ABC, Generic[T]):
         """
         return f"{self.__module__}"
 
+    def get_codec(self) -> str:
+        """
+        Returns the avro codec used to compress cached data files. This
+        defaults to snappy, which decompresses faster than the disk reads it
+        saves. This can be overridden by subclasses whose data compresses
+        better with another fastavro codec, such as "deflate" or "zstandard".
+        """
+        return "snappy"
+
     @abstractmethod
     def get_schema(self) -> dict:
         """
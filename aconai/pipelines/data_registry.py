@@ -1,9 +1,13 @@
+from contextlib import contextmanager
 from dataclasses import dataclass
 import json
 import os
-from typing import Optional
+from types import TracebackType
+from typing import Iterator, Literal, Optional, TypeAlias
 from avro.schema import Schema, parse
 
+Persist: TypeAlias = Literal["eager", "lazy"]
+
 @dataclass
 class RegisteredFile:
     file_name: str
@@ -16,21 +20,78 @@ class DataRegistry:
     Note: This class is not thread-safe, and is assumed to be the sole owner
     of the data directory. If some other process writes to the directory,
     the registry may become inconsistent.
+
+    A registry can also be used as a context manager, which calls close() on
+    exit. This is required for lazily persisted registries.
     """        
     DATA_CACHE_DIR = "DATA_CACHE_DIR"
+    INMEMORY_DATA_DIR = "inmemory"
     _SCHEMA = "schema"
     _FILES = "files"
     _IS_MARKED_WRITTEN = "is_marked_written"
     _FILE_NAME = "file_name"
     _PARAMETERS = "parameters"
+    _NEXT_ID = "next_id"
 
     def _update_registry(self) -> None:
         """
-        Updates the registry file with the current state of the registry.
+        Updates the registry file with the current state of the registry. If
+        called inside a batch(), the write is deferred until the batch exits.
+        If the registry is persisted lazily, it is deferred until close().
+        """
+        self._dirty = True
+        if self._batch_depth == 0 and self.persist == "eager":
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes any pending changes to the registry file. The registry is
+        written to a temporary file first and then moved into place, so a
+        crash mid-write never leaves a truncated registry behind.
+        """
+        if not self._dirty or self.inmemory:
+            return
+        tmp_file = self.registry_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.registry, f)
+        os.replace(tmp_file, self.registry_file)
+        self._dirty = False
+
+    @contextmanager
+    def batch(self) -> Iterator["DataRegistry"]:
+        """
+        A context manager that defers registry writes until the outermost
+        batch exits, so a sequence of updates results in a single write.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self.persist == "eager":
+                self.flush()
+
+    def close(self) -> None:
+        """
+        Writes any pending changes to the registry file.
         """
-        json.dump(self.registry, open(self.registry_file, "w"))
+        self.flush()
+
+    def __enter__(self) -> "DataRegistry":
+        return self
+
+    def __exit__(
+            self,
+            exc_type: Optional[type[BaseException]],
+            exc: Optional[BaseException],
+            tb: Optional[TracebackType]) -> None:
+        self.close()
 
-    def __init__(self, data_dir: Optional[str] = None) -> None:
+    def __init__(
+            self,
+            data_dir: Optional[str] = None,
+            persist: Persist = "eager",
+            inmemory: bool = False) -> None:
         """
         Initializes the DataRegistry.
         Args:
@@ -38,18 +99,42 @@ class DataRegistry:
             be stored. If not provided, it will look for the environment 
             variable DATA_CACHE_DIR, which should point to the directory. If
             this directy does not exist, it will be created.
+            persist (Persist): "eager" writes the registry file after every
+            change. "lazy" only writes it on close(), which saves repeated
+            serialization when a registry is changed many times. A new
+            registry file is always written immediately.
+            inmemory (bool): If True, nothing is read from or written to disk.
+            Data providers keep their records in this registry instead of
+            avro files, which is meant for tests with small payloads. In this
+            mode data_dir is optional, only prefixing the in-memory file
+            names, and persist is ignored.
         """
+        if persist not in ("eager", "lazy"):
+            raise ValueError(f"Unknown persist mode {persist!r}.")
+        self.persist = persist
+        self.inmemory = inmemory
         if data_dir is None:
             data_dir = os.getenv(DataRegistry.DATA_CACHE_DIR)
-            if data_dir is None:
+            if data_dir is None and inmemory:
+                # File names are only keys in memory, so any root will do.
+                data_dir = DataRegistry.INMEMORY_DATA_DIR
+            elif data_dir is None:
                 msg = "Environment variable DATA_CACHE_DIR is not set."
                 raise ValueError(msg)
         self.data_dir = data_dir
+        self._dirty = False
+        self._batch_depth = 0
+        self._params_index: dict[str, dict[str, int]] = {}
+        self._schema_cache: dict[str, Schema] = {}
+        self._records: dict[str, list[dict]] = {}
         self.registry_file = os.path.join(data_dir, "data_registry.json")
-        if not os.path.exists(data_dir):
+        if inmemory:
+            self.registry: dict[str, dict] = {}
+        elif not os.path.exists(data_dir):
             os.makedirs(data_dir)
             self.registry = {}
-            self._update_registry()
+            self._dirty = True
+            self.flush()
         else:
             with open(self.registry_file, "r") as f:
                 self.registry = json.load(f)
@@ -69,13 +154,23 @@ class DataRegistry:
             self.registry[key] = {
                 DataRegistry._SCHEMA: schema.to_json(),
                 DataRegistry._FILES: [],
+                DataRegistry._NEXT_ID: 0,
             }
+            self._schema_cache[key] = schema
             self._update_registry()
             return True
         else:
-            as_json = json.dumps(self.registry[key][DataRegistry._SCHEMA])
-            stored_schema = parse(as_json)
-            if stored_schema == schema:
+            stored_schema = self._schema_cache.get(key)
+            if stored_schema is None:
+                as_json = json.dumps(self.registry[key][DataRegistry._SCHEMA])
+                stored_schema = parse(as_json)
+                self._schema_cache[key] = stored_schema
+            if schema is stored_schema:
+                return True
+            elif stored_schema == schema:
+                # Remember the caller's schema object, so repeated calls with
+                # it skip the comparison.
+                self._schema_cache[key] = schema
                 return True
             else:
                 return False
@@ -91,28 +186,62 @@ class DataRegistry:
         """
         key_folders = key.replace(".", os.sep)
         path = os.path.join(self.data_dir, key_folders)
-        if not os.path.exists(path):
+        if not self.inmemory and not os.path.exists(path):
             os.makedirs(path)
         return path
     
-    def _get_next_data_file(self, path: str) -> str:
+    def _next_file_id(self, key: str) -> int:
         """
-        Returns the a unique file name for the given path.
+        Returns the next unused data file number for the given key, and
+        advances the counter stored in the registry.
         Args:
-            path (str): The path to the data files.
+            key (str): The key of the data input.
         Returns:
-            str: The latest data file in the given path.
+            int: The number to use in the next data file name.
         """
-        files = os.listdir(path)
-        if not files:
-            latest_file = "data_0.avro"
+        entry = self.registry[key]
+        if DataRegistry._NEXT_ID in entry:
+            num = entry[DataRegistry._NEXT_ID]
         else:
-            latest_file = max(files)
-            root = os.path.splitext(latest_file)[0]
-            num = int(root.split("_")[-1]) + 1
-            latest_file = f"data_{num}.avro"
-        return os.path.join(path, latest_file)
+            # Registries written before the counter existed: continue after
+            # the highest numbered file.
+            nums = [
+                int(os.path.splitext(f[DataRegistry._FILE_NAME])[0]
+                    .split("_")[-1])
+                for f in entry[DataRegistry._FILES]
+            ]
+            num = max(nums, default=-1) + 1
+        entry[DataRegistry._NEXT_ID] = num + 1
+        return num
             
+    @staticmethod
+    def _params_key(params: dict) -> str:
+        """
+        Returns a canonical string form of the given parameters, used to look
+        up files by their parameters.
+        """
+        return json.dumps(params, sort_keys=True)
+
+    def _file_index(self, key: str) -> dict[str, int]:
+        """
+        Returns a map from the canonical form of each registered file's
+        parameters to its position in the files list for the given key. The
+        map is built from the registry on first use, and kept up to date by
+        register().
+        Args:
+            key (str): The key of the data input.
+        Returns:
+            dict[str, int]: The index of files for the given key.
+        """
+        index = self._params_index.get(key)
+        if index is None:
+            index = {
+                DataRegistry._params_key(file[DataRegistry._PARAMETERS]): i
+                for i, file in enumerate(self.registry[key][DataRegistry._FILES])
+            }
+            self._params_index[key] = index
+        return index
+
     def register(self, key: str, schema: Schema, params: dict) -> RegisteredFile:
         """
         Registers a new data input in the registry. This will validate the 
@@ -132,24 +261,20 @@ class DataRegistry:
         """
         if not self._validate_schema(key, schema):
             raise ValueError(f"Schema for {key} is not valid.")
-        files = []
-        for file in self.registry[key][DataRegistry._FILES]:
-            if file[DataRegistry._PARAMETERS] == params:
-                return RegisteredFile(
-                    file[DataRegistry._FILE_NAME],
-                    file[DataRegistry._IS_MARKED_WRITTEN]
-                )
-            files.append(file[DataRegistry._FILE_NAME])
+        files = self.registry[key][DataRegistry._FILES]
+        index = self._file_index(key)
+        params_key = DataRegistry._params_key(params)
+        if params_key in index:
+            file = files[index[params_key]]
+            return RegisteredFile(
+                file[DataRegistry._FILE_NAME],
+                file[DataRegistry._IS_MARKED_WRITTEN]
+            )
         path = self._ensure_path_exists(key)
-        if not files:
-            latest_file = "data_0.avro"
-        else:
-            latest_file = max(files)
-            root = os.path.splitext(latest_file)[0]
-            num = int(root.split("_")[-1]) + 1
-            latest_file = f"data_{num}.avro"
-        file_name = os.path.join(path, latest_file)        
-        self.registry[key][DataRegistry._FILES].append({
+        num = self._next_file_id(key)
+        file_name = os.path.join(path, f"data_{num}.avro")
+        index[params_key] = len(files)
+        files.append({
             DataRegistry._FILE_NAME: file_name,
             DataRegistry._PARAMETERS: params,
             DataRegistry._IS_MARKED_WRITTEN: False
@@ -176,3 +301,28 @@ class DataRegistry:
                     True,
                 )
         raise ValueError(f"File {file_name} not found in registry.")
+
+    def store_records(self, file_name: str, records: list[dict]) -> None:
+        """
+        Stores the records for the given file in memory. Only supported for
+        in-memory registries, where it takes the place of writing the file.
+        Args:
+            file_name (str): The name of the registered file.
+            records (list[dict]): The records of the file.
+        """
+        if not self.inmemory:
+            raise ValueError("Records can only be stored in an in-memory"
+                             " registry.")
+        self._records[file_name] = records
+
+    def stored_records(self, file_name: str) -> list[dict]:
+        """
+        Returns the records stored for the given file with store_records().
+        Args:
+            file_name (str): The name of the registered file.
+        Returns:
+            list[dict]: The records of the file.
+        """
+        if file_name not in self._records:
+            raise ValueError(f"No records stored for {file_name}.")
+        return self._records[file_name]
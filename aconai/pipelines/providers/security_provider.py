@@ -1,6 +1,7 @@
 from datetime import date
 from typing import Iterable
 
+import numpy as np
 import pandas as pd
 from aconai.pipelines.data_provider import DataProvider
 from aconai.pipelines.data_registry import DataRegistry
@@ -8,6 +9,74 @@ import yfinance as yf
 from curl_cffi import requests
 
 
+_SCHEMA = {
+    "type": "record",
+    "name": "StockPriceData",
+    "namespace": "aconai",
+    "fields": [
+        {
+        "name": "price_data",
+        "type": {
+            "type": "array",
+            "items": {
+            "type": "record",
+            "name": "PriceEntry",
+            "fields": [
+                {
+                "name": "date",
+                "type": {
+                    "type": "int",
+                    "logicalType": "date"
+                }
+                },
+                {
+                "name": "open",
+                "type": "double"
+                },
+                {
+                "name": "high",
+                "type": "double"
+                },
+                {
+                "name": "low",
+                "type": "double"
+                },
+                {
+                "name": "close",
+                "type": "double"
+                },
+                {
+                "name": "adj_open",
+                "type": "double"
+                },
+                {
+                "name": "adj_high",
+                "type": "double"
+                },
+                {
+                "name": "adj_low",
+                "type": "double"
+                },
+                {
+                "name": "adj_close",
+                "type": "double"
+                },
+                {
+                "name": "dividend",
+                "type": "double"
+                },
+                {
+                "name": "split",
+                "type": "double"
+                }
+            ]
+            }
+        }
+        }
+    ]
+}
+
+
 class SecurityProvider(DataProvider[pd.DataFrame]):
     """
     A class for downloading security price data.
@@ -32,72 +101,7 @@ class SecurityProvider(DataProvider[pd.DataFrame]):
         self.end_date = end_date
 
     def get_schema(self) -> dict:
-        return {
-            "type": "record",
-            "name": "StockPriceData",
-            "namespace": "aconai",
-            "fields": [
-                {
-                "name": "price_data",
-                "type": {
-                    "type": "array",
-                    "items": {
-                    "type": "record",
-                    "name": "PriceEntry",
-                    "fields": [
-                        {
-                        "name": "date",
-                        "type": {
-                            "type": "int",
-                            "logicalType": "date"
-                        }
-                        },
-                        {
-                        "name": "open",
-                        "type": "double"
-                        },
-                        {
-                        "name": "high",
-                        "type": "double"
-                        },
-                        {
-                        "name": "low",
-                        "type": "double"
-                        },
-                        {
-                        "name": "close",
-                        "type": "double"
-                        },
-                        {
-                        "name": "adj_open",
-                        "type": "double"
-                        },
-                        {
-                        "name": "adj_high",
-                        "type": "double"
-                        },
-                        {
-                        "name": "adj_low",
-                        "type": "double"
-                        },
-                        {
-                        "name": "adj_close",
-                        "type": "double"
-                        },
-                        {
-                        "name": "dividend",
-                        "type": "double"
-                        },
-                        {
-                        "name": "split",
-                        "type": "double"
-                        }
-                    ]
-                    }
-                }
-                }
-            ]
-        }
+        return _SCHEMA
     
     def get_records(self) -> Iterable[dict]:
         """
@@ -112,29 +116,36 @@ class SecurityProvider(DataProvider[pd.DataFrame]):
             auto_adjust=False,
             actions=True
         )
-        ratio = (df["Adj Close"] / df["Close"]).to_numpy()
-        df["Adj Open"] = df["Open"] * ratio
-        df["Adj High"] = df["High"] * ratio
-        df["Adj Low"] = df["Low"] * ratio
 
-        price_data = []
-        for d, row in df.iterrows():
-            entry = {
-                "date": d.date(),
-                "open": float(row["Open"]),
-                "high": float(row["High"]),
-                "low": float(row["Low"]),
-                "close": float(row["Close"]),
-                "adj_open": float(row["Adj Open"]),
-                "adj_high": float(row["Adj High"]),
-                "adj_low": float(row["Adj Low"]),
-                "adj_close": float(row["Adj Close"]),
-                "dividend": float(row["Dividends"]),
-                "split": float(row["Stock Splits"]),
-            }
-            price_data.append(entry)
+        def column(name: str) -> np.ndarray:
+            # For a single symbol, yfinance may return each price field as a
+            # one-column frame, so flatten it to one value per row.
+            return df[name].to_numpy(dtype=np.float64).reshape(-1)
+
+        close = column("Close")
+        adj_close = column("Adj Close")
+        prices = np.stack((column("Open"), column("High"), column("Low")))
+        adj_prices = prices * (adj_close / close)
+
+        fields = {
+            "open": prices[0].tolist(),
+            "high": prices[1].tolist(),
+            "low": prices[2].tolist(),
+            "close": close.tolist(),
+            "adj_open": adj_prices[0].tolist(),
+            "adj_high": adj_prices[1].tolist(),
+            "adj_low": adj_prices[2].tolist(),
+            "adj_close": adj_close.tolist(),
+            "dividend": column("Dividends").tolist(),
+            "split": column("Stock Splits").tolist(),
+        }
+        names = list(fields)
+        price_data = [
+            {"date": d, **dict(zip(names, values))}
+            for d, *values in zip(df.index.date, *fields.values())
+        ]
 
-        return [{"price_data": price_data}]
+        yield {"price_data": price_data}
 
     def get_parameters(self) -> dict:
         return {
@@ -1,12 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
 from dateutil.relativedelta import relativedelta
 from typing import Iterable, List
 import numpy as np
+import orjson
 import pandas as pd
 import requests
 from aconai.pipelines.data_provider import DataProvider
 from aconai.pipelines.data_registry import DataRegistry
 
+_DATAGETTER_URL = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
+_DATE_FORMAT = "%Y%m%d"
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+
+_SCHEMA = {
+    "namespace": "gov.noaa.coops.tides",
+    "type": "record",
+    "name": "TideYearData",
+    "doc": "Verified high/low‑water observations returned by the NOAA CO‑OPS high_low product for a single station and one‑year window.",
+    "fields": [
+        {
+        "name": "extremes",
+        "type": {
+            "type": "array",
+            "items": {
+            "name": "TideExtreme",
+            "type": "record",
+            "fields": [
+                {
+                "name": "timestamp",
+                "type": { "type": "long", "logicalType": "timestamp-millis" },
+                "doc": "Local time of the high/low (epoch‑millis)."
+                },
+                {
+                "name": "extreme_type",
+                "type": {
+                    "type": "enum",
+                    "name": "ExtremeType",
+                    "symbols": [ "HH", "H", "L", "LL" ]
+                },
+                "doc": "HH = Higher‑High, H = High, L = Low, LL = Lower‑Low."
+                },
+                {
+                "name": "height",
+                "type": "double",
+                "doc": "Water level relative to the chosen datum."
+                }
+            ]
+            }
+        },
+        "doc": "Ordered list of successive high/low‑water observations."
+        }
+    ]
+}
+
 
 class TidalProvider(DataProvider[pd.DataFrame]):
     """
@@ -30,6 +78,9 @@ class TidalProvider(DataProvider[pd.DataFrame]):
         self.station = station
         self.start_date = start_date
         self.years = years
+        # Reused across yearly requests for HTTP keep-alive. The underlying
+        # connection pool is shared safely by the fetch threads.
+        self._session = requests.Session()
 
     def get_parameters(self) -> dict:
         """
@@ -42,46 +93,7 @@ class TidalProvider(DataProvider[pd.DataFrame]):
         }
 
     def get_schema(self) -> dict:
-        return {
-            "namespace": "gov.noaa.coops.tides",
-            "type": "record",
-            "name": "TideYearData",
-            "doc": "Verified high/low‑water observations returned by the NOAA CO‑OPS high_low product for a single station and one‑year window.",
-            "fields": [
-                {
-                "name": "extremes",
-                "type": {
-                    "type": "array",
-                    "items": {
-                    "name": "TideExtreme",
-                    "type": "record",
-                    "fields": [
-                        {
-                        "name": "timestamp",
-                        "type": { "type": "long", "logicalType": "timestamp-millis" },
-                        "doc": "Local time of the high/low (epoch‑millis)."
-                        },
-                        {
-                        "name": "extreme_type",
-                        "type": {
-                            "type": "enum",
-                            "name": "ExtremeType",
-                            "symbols": [ "HH", "H", "L", "LL" ]
-                        },
-                        "doc": "HH = Higher‑High, H = High, L = Low, LL = Lower‑Low."
-                        },
-                        {
-                        "name": "height",
-                        "type": "double",
-                        "doc": "Water level relative to the chosen datum."
-                        }
-                    ]
-                    }
-                },
-                "doc": "Ordered list of successive high/low‑water observations."
-                }
-            ]
-        }
+        return _SCHEMA
     
     def _get_one_year(self, start_date) -> pd.DataFrame:
         """
@@ -94,18 +106,17 @@ class TidalProvider(DataProvider[pd.DataFrame]):
         application = "aconai"
         if isinstance(start_date, str):
             start_date = dt.datetime.strptime(
-                start_date.replace("-", ""), "%Y%m%d"
+                start_date.replace("-", ""), _DATE_FORMAT
             ).date()
         elif isinstance(start_date, dt.datetime):
             start_date = start_date.date()
 
         end_date = start_date + dt.timedelta(days=365) - dt.timedelta(seconds=1)
-        fmt = "%Y%m%d"
 
         params = {
             "product": "high_low",
-            "begin_date": start_date.strftime(fmt),
-            "end_date": end_date.strftime(fmt),
+            "begin_date": start_date.strftime(_DATE_FORMAT),
+            "end_date": end_date.strftime(_DATE_FORMAT),
             "datum": datum,
             "station": station,
             "units": units,
@@ -114,10 +125,9 @@ class TidalProvider(DataProvider[pd.DataFrame]):
             "application": application,
         }
 
-        url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
-        resp = requests.get(url, params=params, timeout=30)
+        resp = self._session.get(_DATAGETTER_URL, params=params, timeout=30)
         resp.raise_for_status()
-        raw = resp.json()
+        raw = orjson.loads(resp.content)
 
         df = pd.DataFrame(raw["data"])
         df = df.rename(columns={"t": "timestamp",
@@ -131,7 +141,9 @@ class TidalProvider(DataProvider[pd.DataFrame]):
         else:
             raise KeyError("Expected column 'ty' not found in API response")
         
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        df["timestamp"] = pd.to_datetime(
+            df["timestamp"], format=_TIMESTAMP_FORMAT, cache=True
+        )
         df["height"]    = pd.to_numeric(df["height"], errors="coerce")
         df = df[["timestamp", "type", "height"]]
 
@@ -147,18 +159,21 @@ class TidalProvider(DataProvider[pd.DataFrame]):
         years = self.years
         if isinstance(start_date, str):
             current_start = dt.datetime.strptime(
-                start_date.replace("-", ""), "%Y%m%d"
+                start_date.replace("-", ""), _DATE_FORMAT
             ).date()
         elif isinstance(start_date, dt.datetime):
             current_start = start_date.date()
         else:  # already a date
             current_start = start_date
 
-        yearly_frames: List[pd.DataFrame] = []
-
-        for _ in range(years):
-            yearly_frames.append(self._get_one_year(current_start))
-            current_start = current_start + relativedelta(years=1)
+        starts = [
+            current_start + relativedelta(years=i) for i in range(years)
+        ]
+        # The yearly requests are independent, so fetch them concurrently.
+        with ThreadPoolExecutor(max_workers=min(max(years, 1), 8)) as ex:
+            yearly_frames: List[pd.DataFrame] = list(
+                ex.map(self._get_one_year, starts)
+            )
 
         full_df = (
             pd.concat(yearly_frames, ignore_index=True)
@@ -177,19 +192,15 @@ class TidalProvider(DataProvider[pd.DataFrame]):
         """
         df = self._get_multi_years()
 
-        UTC = dt.timezone.utc        
-        ts_aware = (
-            df["timestamp"]
-              .dt.round("ms")
-              .apply(
-                  lambda ts: ts.to_pydatetime().replace(tzinfo=UTC)
-              )
-        )
-        extremes = pd.DataFrame({
-            "timestamp":    ts_aware,
-            "extreme_type": df["type"].astype(str),
-            "height":       df["height"].astype("float64"),
-        }).to_dict(orient="records")
+        ts_aware = df["timestamp"].dt.round("ms").dt.tz_localize("UTC")
+        extremes = [
+            {"timestamp": ts, "extreme_type": ty, "height": h}
+            for ts, ty, h in zip(
+                ts_aware.array.to_pydatetime(),
+                df["type"].astype(str).tolist(),
+                df["height"].astype("float64").tolist(),
+            )
+        ]
         return {"extremes": extremes}    
 
     def get_records(self) -> Iterable[dict]:
@@ -1,4 +1,5 @@
-from typing import Tuple, TypeAlias
+from functools import cache
+from typing import Callable, Literal, Optional, Sequence, Tuple, TypeAlias
 from pandas import DataFrame
 from torch import Tensor
 import torch
@@ -6,6 +7,55 @@ from torch.utils.data import Dataset
 import numpy as np
 
 Columns: TypeAlias = str | list[str]
+Layout: TypeAlias = Literal["row", "col"]
+
+def _to_tensor(df: DataFrame,
+               dtype: type[np.generic],
+               layout: Layout = "row") -> Tensor:
+    """
+    Converts a DataFrame to a tensor of the given dtype, stored row-major or
+    column-major according to layout. The tensor shares memory with the array
+    pandas returns, which is only copied if it does not already have the
+    requested layout, or is not writable.
+    """
+    arr = df.to_numpy(dtype=dtype)
+    if layout == "row":
+        arr = np.ascontiguousarray(arr)
+    else:
+        arr = np.asfortranarray(arr)
+    if not arr.flags.writeable:
+        arr = arr.copy()
+    return torch.from_numpy(arr)
+
+def _gather(t: Tensor, indices: list[int]) -> Tensor:
+    """
+    Gathers the given rows of t into a new tensor. If t is in pinned memory,
+    the result is gathered into a pinned buffer too, so batches keep the
+    asynchronous host-to-device copies that pinning enables.
+    """
+    if not t.is_pinned():
+        return t[indices]
+    index = torch.as_tensor(indices, dtype=torch.int64)
+    # index_select does not accept negative indices, unlike t[indices].
+    index = torch.where(index < 0, index + t.shape[0], index)
+    out = torch.empty((index.shape[0],) + t.shape[1:], dtype=t.dtype,
+                      pin_memory=True)
+    return torch.index_select(t, 0, index, out=out)
+
+@cache
+def _row_kernel(func: Callable) -> Callable:
+    """
+    Compiles a parallel numba kernel that applies the jitted func to each
+    indexed row. Kernels are cached per func, so each compiles only once.
+    """
+    from numba import njit, prange
+
+    @njit(parallel=True)
+    def kernel(rows, indices, out):
+        for k in prange(indices.shape[0]):
+            out[k] = func(rows[indices[k]])
+
+    return kernel
 
 class RowAccessor(Dataset[Tuple[Tensor, Tensor]]):
     """
@@ -15,37 +65,136 @@ class RowAccessor(Dataset[Tuple[Tensor, Tensor]]):
     """
     def __init__(self,  
                  df: DataFrame,
-                 labels: Columns):
+                 labels: Columns,
+                 pin_memory: bool = False,
+                 label_dtype: torch.dtype | None = None,
+                 dtype: torch.dtype = torch.float32,
+                 layout: Layout = "row"):
         """
         Args:
             df (DataFrame): DataFrame containing the data.
             labels (Columns): Column names for the labels.
+            pin_memory (bool): If True, the tensors are stored in page-locked
+                memory, so rows can be copied to a CUDA device
+                asynchronously with `.to(device, non_blocking=True)`.
+                Requires a CUDA-enabled PyTorch build.
+            label_dtype (torch.dtype, optional): The dtype of the label
+                tensor. Defaults to int64 if every label column has an
+                integer or boolean dtype, as classification losses expect,
+                and float32 otherwise.
+            dtype (torch.dtype): The floating point dtype of the feature
+                tensor. torch.float16 or torch.bfloat16 halve the memory and
+                bandwidth used per row compared to the default float32.
+            layout (Layout): How the feature tensor is stored. "row" keeps
+                each row contiguous, which suits batched row access. "col"
+                keeps each column contiguous, so column reductions such as
+                normalization statistics read memory sequentially, at the
+                cost of slower row access.
         """
+        if layout not in ("row", "col"):
+            raise ValueError(f"Unknown layout {layout!r}.")
+        if not dtype.is_floating_point:
+            raise ValueError(
+                f"Feature dtype must be floating point, got {dtype}"
+            )
         label_cols = [labels] if isinstance(labels, str) else labels
-        missing = [c for c in label_cols if c not in df.columns]
+        column_set = set(df.columns)
+        missing = [c for c in label_cols if c not in column_set]
         if missing:
             raise ValueError(
                 f"Label column(s) {missing} not present in DataFrame columns" 
                 f" {list(df.columns)}"
             )
-        feature_df = df.drop(columns=label_cols)
-        label_df = df[label_cols]
-        if feature_df.empty:
+        label_set = set(label_cols)
+        feature_idx = [
+            i for i, c in enumerate(df.columns) if c not in label_set
+        ]
+        if not feature_idx:
             raise ValueError("After dropping label columns, no feature columns"
                              " remain.")
-        self._features = torch.as_tensor(
-            feature_df.to_numpy(dtype=np.float32, copy=True),  # force one numeric dtype
-            dtype=torch.float32,
-        )
-        self._labels = torch.as_tensor(
-            label_df.to_numpy(dtype=np.float32, copy=True),    # or int64 if preferred
-            dtype=torch.float32,
-        )
-        self.feature_names = feature_df.columns
+        feature_df = df.iloc[:, feature_idx]
+        label_df = df[label_cols]
+        # bfloat16 has no numpy equivalent, so convert through float32.
+        self._features = _to_tensor(feature_df, np.float32, layout).to(dtype)
+        if all(col_dtype.kind in "iub" for col_dtype in label_df.dtypes):
+            self._labels = _to_tensor(label_df, np.int64)
+        else:
+            self._labels = _to_tensor(label_df, np.float32)
+        if label_dtype is not None:
+            self._labels = self._labels.to(label_dtype)
+        if pin_memory:
+            self._features = self._features.pin_memory()
+            self._labels = self._labels.pin_memory()
+        # Zero-copy views of each row, so __getitem__ is a list lookup
+        # rather than a tensor indexing call.
+        self._feature_rows = list(self._features.unbind(0))
+        self._label_rows = list(self._labels.unbind(0))
+        self.feature_names: list[str] = list(feature_df.columns)
+        self.feature_name_to_idx: dict[str, int] = {
+            name: i for i, name in enumerate(self.feature_names)
+        }
         self.label_names = label_cols
 
     def __len__(self) -> int:
         return self._features.shape[0]
 
     def __getitem__(self, idx: int) -> Tuple[Tensor, Tensor]:
-        return self._features[idx], self._labels[idx]
\ No newline at end of file
+        return self._feature_rows[idx], self._label_rows[idx]
+
+    def __getitems__(self, indices: list[int]) -> list[Tuple[Tensor, Tensor]]:
+        """
+        Fetches a batch of rows with one gather per tensor, rather than one
+        __getitem__ call per row. DataLoader uses this automatically. With
+        pin_memory, each batch is gathered into pinned memory.
+        """
+        return list(zip(
+            _gather(self._features, indices).unbind(0),
+            _gather(self._labels, indices).unbind(0),
+        ))
+
+    def col(self, name: str) -> Tensor:
+        """
+        Returns a view of the feature column with the given name. The view is
+        contiguous when the accessor uses the "col" layout.
+        """
+        return self._features[:, self.feature_name_to_idx[name]]
+
+    def map_rows(self,
+                 func: Callable[[np.ndarray], np.ndarray | float],
+                 indices: Optional[Sequence[int]] = None) -> Tensor:
+        """
+        Applies a numba @njit function to feature rows in parallel, operating
+        directly on the stored float32 buffer. This is intended for per-row
+        preprocessing that would be slow as a Python loop. Requires numba.
+        Args:
+            func (Callable): A numba-jitted function mapping one feature row
+                to a scalar or an array, with the same output shape for
+                every row.
+            indices (Sequence[int], optional): The rows to map. Negative
+                indices count from the end. Defaults to all rows.
+        Returns:
+            Tensor: The stacked outputs, one per index.
+        Raises:
+            IndexError: If an index is out of range.
+        """
+        if self._features.dtype != torch.float32:
+            raise ValueError("map_rows requires float32 features, got"
+                             f" {self._features.dtype}")
+        if indices is None:
+            idx: np.ndarray = np.arange(len(self), dtype=np.int64)
+        else:
+            idx = np.asarray(indices, dtype=np.int64)
+        # numba does not bounds-check, so an out-of-range index would read
+        # past the buffer rather than raise.
+        n = len(self)
+        out_of_range = (idx < -n) | (idx >= n)
+        if out_of_range.any():
+            raise IndexError(f"Index {idx[out_of_range][0]} is out of range"
+                             f" for {n} rows")
+        idx = np.where(idx < 0, idx + n, idx)
+        rows = self._features.numpy()
+        # Run func once to find the shape and dtype of its output.
+        sample = np.asarray(func(rows[0]) if len(self) else np.float32(0))
+        out = np.empty(idx.shape + sample.shape, dtype=sample.dtype)
+        _row_kernel(func)(rows, idx, out)
+        return torch.from_numpy(out)
\ No newline at end of file
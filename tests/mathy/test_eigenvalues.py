@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 import numpy as np
 
 from aconai.mathy.eigenvalues import eig
@@ -11,4 +12,55 @@ class TestEig(unittest.TestCase):
             (5 + np.sqrt(33)) / 2,
             (5 - np.sqrt(33)) / 2
         ])
-        np.testing.assert_almost_equal(lambdas, expected)
\ No newline at end of file
+        self.assertTrue(np.allclose(lambdas, expected, rtol=0, atol=1e-7))
+
+    def test_eig_symmetric(self):
+        A = np.array([
+            [4.0, 1.0, 2.0, 0.5],
+            [1.0, 3.0, 0.0, 1.0],
+            [2.0, 0.0, -2.0, 1.5],
+            [0.5, 1.0, 1.5, 1.0],
+        ])
+        lambdas = eig(A, tol=1e-10)
+        expected = np.linalg.eigvalsh(A)
+        self.assertTrue(
+            np.allclose(np.sort(lambdas), expected, rtol=0, atol=1e-7)
+        )
+
+    def test_eig_empty(self):
+        lambdas = eig(np.zeros((0, 0)))
+        self.assertEqual(lambdas.shape, (0,))
+
+    def test_eig_rejects_complex(self):
+        with self.assertRaises(ValueError):
+            eig(np.array([[2, 1j], [-1j, 3]]))
+
+    def test_eig_complex_pair(self):
+        A = np.array([[2.0, 0.0, 0.0], [0.0, 0.0, -1e-8], [0.0, 1e-8, 0.0]])
+        lambdas = eig(A)
+        expected = np.array([2.0, 1e-8j, -1e-8j])
+        self.assertTrue(np.allclose(lambdas, expected, rtol=0, atol=1e-12))
+
+    def test_eig_complex_pair_in_larger_block(self):
+        V = np.random.default_rng(1).standard_normal((3, 3))
+        R = np.array([[0.6, -0.8, 0.0], [0.8, 0.6, 0.0], [0.0, 0.0, 2.0]])
+        lambdas = eig(V @ R @ np.linalg.inv(V), tol=1e-12)
+        expected = np.array([2.0, 0.6 + 0.8j, 0.6 - 0.8j])
+        self.assertTrue(np.allclose(
+            np.sort_complex(lambdas), np.sort_complex(expected),
+            rtol=0, atol=1e-7
+        ))
+
+    def test_eig_nilpotent(self):
+        V = np.random.default_rng(1).standard_normal((3, 3))
+        J = np.diag([1.0, 1.0], 1)
+        lambdas = eig(V @ J @ np.linalg.inv(V), tol=1e-10)
+        # Perturbing a 3x3 Jordan block by tol moves its eigenvalues by
+        # about tol ** (1 / 3), so they are only close to zero.
+        self.assertTrue(np.allclose(lambdas, 0.0, rtol=0, atol=1e-3))
+
+    def test_eig_max_steps(self):
+        A = np.array([[1.0, 2.0], [3.0, 4.0]])
+        with patch("aconai.mathy.eigenvalues._MAX_STEPS_PER_EIGENVALUE", 0):
+            with self.assertRaises(np.linalg.LinAlgError):
+                eig(A)
@@ -8,6 +8,18 @@ class TestQR(unittest.TestCase):
         A = np.array([[4.0, 1.0], [1.0, 3.0]])
         Q, R = qr(A)
         maybe_I = np.transpose(Q) @ Q
-        np.testing.assert_almost_equal(maybe_I, np.identity(2))
-        np.testing.assert_almost_equal(R, np.triu(R))
-        np.testing.assert_almost_equal(Q @ R, A)
\ No newline at end of file
+        self.assertTrue(np.allclose(maybe_I, np.identity(2), rtol=0, atol=1e-7))
+        self.assertTrue(np.allclose(R, np.triu(R), rtol=0, atol=1e-7))
+        self.assertTrue(np.allclose(Q @ R, A, rtol=0, atol=1e-7))
+        self.assertTrue(np.all(np.diag(R) >= 0))
+
+    def test_qr_negative_pivot(self):
+        A = -np.array([[4.0, 1.0], [1.0, 3.0]])
+        # Without the sign fix, LAPACK returns a negative pivot here.
+        self.assertTrue(np.any(np.diag(np.linalg.qr(A)[1]) < 0))
+        Q, R = qr(A)
+        self.assertTrue(np.all(np.diag(R) >= 0))
+        self.assertTrue(np.allclose(Q @ R, A, rtol=0, atol=1e-7))
+        self.assertTrue(
+            np.allclose(np.transpose(Q) @ Q, np.identity(2), rtol=0, atol=1e-7)
+        )
@@ -1,6 +1,7 @@
 from datetime import date
 import os
 import shutil
+import tempfile
 import unittest
 import pandas as pd
 from aconai.pipelines.data_registry import DataRegistry
@@ -8,13 +9,12 @@ from aconai.pipelines.providers.security_provider import SecurityProvider
 
 class TestSecurityProvider(unittest.TestCase):
     def setUp(self):
-        self.data_dir = "/tmp/data_cache"
-        if os.path.exists(self.data_dir):
-            shutil.rmtree(self.data_dir)
+        self.tmp_dir = tempfile.mkdtemp(prefix="aconai_test_")
+        self.data_dir = os.path.join(self.tmp_dir, "data_cache")
         self.registry = DataRegistry(self.data_dir)
 
     def tearDown(self):
-        shutil.rmtree(self.data_dir)
+        shutil.rmtree(self.tmp_dir)
 
     def test_cached_read(self):
         provider = SecurityProvider(
@@ -22,9 +22,9 @@ class TestSecurityProvider(unittest.TestCase):
             "AAPL",
             date(2020, 1, 1),
             date(2025, 1, 1))
-        results = list(provider.cached_read())
-        self.assertEqual(len(results), 1)
-        df = results[0]
+        results = iter(provider.cached_read())
+        df = next(results)
+        self.assertRaises(StopIteration, next, results)
         self.assertIsInstance(df, pd.DataFrame)
         self.assertEqual(df.shape, (1258, 11))
         column_names = [
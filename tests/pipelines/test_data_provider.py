@@ -1,5 +1,6 @@
 import os
 import shutil
+import tempfile
 import unittest
 from aconai.pipelines.data_provider import DataProvider
 from aconai.pipelines.data_registry import DataRegistry
@@ -26,20 +27,21 @@ class TestableDataProvider(DataProvider[object]):
     
 class BaseTestDataProvider(unittest.TestCase):
     def setUp(self):
-        self.data_dir = "/tmp/data_cache"
-        if os.path.exists(self.data_dir):
-            shutil.rmtree(self.data_dir)
-        self.registry = DataRegistry(self.data_dir)
-
-    def tearDown(self):
-        shutil.rmtree(self.data_dir)
+        self.tmp_dir = tempfile.mkdtemp(prefix="aconai_test_")
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.data_dir = os.path.join(self.tmp_dir, "data_cache")
+        self.registry = DataRegistry(self.data_dir, persist="lazy")
+        self.addCleanup(self.registry.close)
 
 class TestCachedReadNotWritten(BaseTestDataProvider):
 
     def test_write_when_not_written(self):
         dp = TestableDataProvider(self.registry)
         records = dp.cached_read()
-        expected_file = '/tmp/data_cache/pipelines/test_data_provider/TestableDataProvider/data_0.avro'
+        expected_file = os.path.join(
+            self.data_dir,
+            'pipelines/test_data_provider/TestableDataProvider/data_0.avro'
+        )
         expected_records = [{"test": 1}, {"test": 2}]
         self.assertTrue(os.path.isfile(expected_file))
         self.assertEqual(list(records), expected_records)
@@ -49,7 +51,10 @@ class TestCachedReadWritten(BaseTestDataProvider):
    def test_no_write_when_written(self):
         dp = TestableDataProvider(self.registry)
         dp.cached_read()
-        expected_file = '/tmp/data_cache/pipelines/test_data_provider/TestableDataProvider/data_0.avro'
+        expected_file = os.path.join(
+            self.data_dir,
+            'pipelines/test_data_provider/TestableDataProvider/data_0.avro'
+        )
         expected_records = [{"test": 1}, {"test": 2}]
         mtime_before = os.path.getmtime(expected_file)
         records = dp.cached_read()  # Should skip writing
@@ -85,6 +90,22 @@ class TestCachedReadCustomType(BaseTestDataProvider):
         expected_records = [1, 2]
         self.assertEqual(list(records), expected_records)
 
+class TestCachedReadInMemory(BaseTestDataProvider):
+
+    def test_in_memory_read_skips_files(self):
+        data_dir = os.path.join(self.tmp_dir, "in_memory")
+        dp = TestableDataProvider(DataRegistry(data_dir, inmemory=True))
+        expected_records = [{"test": 1}, {"test": 2}]
+        self.assertEqual(list(dp.cached_read()), expected_records)
+        self.assertEqual(list(dp.cached_read()), expected_records)
+        self.assertFalse(os.path.exists(data_dir))
+
+    def test_in_memory_read_custom_type(self):
+        data_dir = os.path.join(self.tmp_dir, "in_memory")
+        dp = TypedDataProvider(DataRegistry(data_dir, inmemory=True))
+        self.assertEqual(list(dp.cached_read()), [1, 2])
+        self.assertEqual(list(dp.cached_read()), [1, 2])
+
 
 if __name__ == "__main__":
     unittest.main()
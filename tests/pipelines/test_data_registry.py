@@ -4,17 +4,43 @@ import unittest
 from unittest.mock import patch
 from aconai.pipelines.data_registry import DataRegistry, RegisteredFile
 import shutil
+import tempfile
 from avro.schema import parse
 
 class BaseTestDataRegistry(unittest.TestCase):
-    def setUp(self):
-        self.data_dir = "/tmp/data_cache"
-        if os.path.exists(self.data_dir):
-            shutil.rmtree(self.data_dir)
+    @classmethod
+    def setUpClass(cls):
+        cls.schema_record = parse(json.dumps({
+            "type": "record",
+            "name": "TestRecord",
+            "fields": [
+                {"name": "field1", "type": "string"},
+                {"name": "field2", "type": "int"}
+            ]
+        }))
+        cls.schema_record_2 = parse(json.dumps({
+            "type": "record",
+            "name": "TestRecord2",
+            "fields": [
+                {"name": "field1", "type": "string"},
+                {"name": "field2", "type": "int"},
+                {"name": "field3", "type": "float"}
+            ]
+        }))
 
-    def tearDown(self):
-        if os.path.exists(self.data_dir):
-            shutil.rmtree(self.data_dir)
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="aconai_test_")
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.data_dir = os.path.join(self.tmp_dir, "data_cache")
+
+    def lazy_registry(self):
+        """
+        Returns a lazily persisted registry, closed when the test finishes,
+        for tests that do not read the registry file back.
+        """
+        registry = DataRegistry(self.data_dir, persist="lazy")
+        self.addCleanup(registry.close)
+        return registry
 
 class TestDataRegistryInit(BaseTestDataRegistry):
     def test_raises_value_error_without_env_var(self):
@@ -22,6 +48,13 @@ class TestDataRegistryInit(BaseTestDataRegistry):
             with self.assertRaises(ValueError):
                 DataRegistry()
 
+    def test_in_memory_without_env_var(self):
+        with patch.dict(os.environ, {}, clear=True):
+            registry = DataRegistry(inmemory=True)
+        registry.register("a/b", self.schema_record, {})
+        registry.close()
+        self.assertFalse(os.path.exists(DataRegistry.INMEMORY_DATA_DIR))
+
     def test_registry_file_exists_after_creation(self):
         DataRegistry(self.data_dir)
         path = os.path.join(self.data_dir, "data_registry.json")
@@ -30,24 +63,9 @@ class TestDataRegistryInit(BaseTestDataRegistry):
 class TestDataRegistryValidateSchema(BaseTestDataRegistry):
 
     def test_validate_schema(self):
-        registry = DataRegistry(self.data_dir)
-        schema_1 = parse(json.dumps({
-            "type": "record",
-            "name": "TestRecord",
-            "fields": [
-                {"name": "field1", "type": "string"},
-                {"name": "field2", "type": "int"}
-            ]
-        }))
-        schema_2 = parse(json.dumps({
-            "type": "record",
-            "name": "TestRecord2",
-            "fields": [
-                {"name": "field1", "type": "string"},
-                {"name": "field2", "type": "int"},
-                {"name": "field3", "type": "float"}
-            ]
-        }))
+        registry = self.lazy_registry()
+        schema_1 = self.schema_record
+        schema_2 = self.schema_record_2
         key = "test.key"
         self.assertTrue(registry._validate_schema(key, schema_1))
         self.assertTrue(registry._validate_schema(key, schema_1))
@@ -55,115 +73,143 @@ class TestDataRegistryValidateSchema(BaseTestDataRegistry):
 
     def test_validate_schema_persistence(self):
         registry_1 = DataRegistry(self.data_dir)
-        schema_1 = parse(json.dumps({
-            "type": "record",
-            "name": "TestRecord2",
-            "fields": [
-                {"name": "field1", "type": "string"},
-                {"name": "field2", "type": "int"},
-                {"name": "field3", "type": "float"}
-            ]
-        }))
+        schema_1 = self.schema_record_2
         key = "test.key.persistence"
         self.assertTrue(registry_1._validate_schema(key, schema_1))
         
         registry_2 = DataRegistry(self.data_dir)
-        schema_2 = parse(json.dumps({
-            "type": "record",
-            "name": "TestRecord",
-            "fields": [
-                {"name": "field1", "type": "string"},
-                {"name": "field2", "type": "int"}
-            ]
-        }))
+        schema_2 = self.schema_record
         self.assertFalse(registry_2._validate_schema(key, schema_2))
         self.assertTrue(registry_2._validate_schema(key, schema_1))
 
 class TestDataRegistryEnsurePathExists(BaseTestDataRegistry):
 
     def test_ensure_path_exists_creates_path(self):
-        registry = DataRegistry(self.data_dir)
+        registry = self.lazy_registry()
         key = "test.key"
         path = registry._ensure_path_exists(key)
-        expected_path = "/tmp/data_cache/test/key"
+        expected_path = os.path.join(self.data_dir, "test", "key")
         self.assertTrue(os.path.exists(path))
         self.assertEqual(path, expected_path)
 
 class TestDataRegistryRegister(BaseTestDataRegistry):
 
     def test_register_with_new_key(self):
-        registry = DataRegistry(self.data_dir)
+        registry = self.lazy_registry()
         key = "test.key.t1"
-        schema = parse(json.dumps({
-            "type": "record",
-            "name": "TestRecord",
-            "fields": [
-                {"name": "field1", "type": "string"},
-                {"name": "field2", "type": "int"}
-            ]
-        }))
+        schema = self.schema_record
         params = {"param1": "value1", "param2": "value2"}
         registered_file = registry.register(key, schema, params)
         expected_registered_file = RegisteredFile(
-            "/tmp/data_cache/test/key/t1/data_0.avro",
+            os.path.join(self.data_dir, "test", "key", "t1", "data_0.avro"),
             False
         )
         self.assertEqual(registered_file, expected_registered_file)
 
     def test_register_with_new_params(self):
-        registry = DataRegistry(self.data_dir)
+        registry = self.lazy_registry()
         key = "test.key.t2"
-        schema = parse(json.dumps({
-            "type": "record",
-            "name": "TestRecord",
-            "fields": [
-                {"name": "field1", "type": "string"},
-                {"name": "field2", "type": "int"}
-            ]
-        }))
+        schema = self.schema_record
         params_1 = {"param1": "value1", "param2": "value2"}
         params_2 = {"param1": "value2", "param2": "value1"}
         registered_file_1 = registry.register(key, schema, params_1)
         registered_file_2 = registry.register(key, schema, params_2)
         expected_registered_file_1 = RegisteredFile(
-            "/tmp/data_cache/test/key/t2/data_0.avro",
+            os.path.join(self.data_dir, "test", "key", "t2", "data_0.avro"),
             False
         )
         expected_registered_file_2 = RegisteredFile(
-            "/tmp/data_cache/test/key/t2/data_1.avro",
+            os.path.join(self.data_dir, "test", "key", "t2", "data_1.avro"),
             False
         )
         self.assertEqual(registered_file_1, expected_registered_file_1)
         self.assertEqual(registered_file_2, expected_registered_file_2)
 
+    def test_register_with_existing_params(self):
+        registry = DataRegistry(self.data_dir)
+        key = "test.key.t2"
+        schema = self.schema_record
+        params_1 = {"param1": "value1", "param2": "value2"}
+        params_2 = {"param2": "value2", "param1": "value1"}
+        registered_file_1 = registry.register(key, schema, params_1)
+        registered_file_2 = DataRegistry(self.data_dir).register(
+            key, schema, params_2
+        )
+        self.assertEqual(registered_file_1, registered_file_2)
+
+    def test_register_past_ten_files(self):
+        registry = self.lazy_registry()
+        key = "test.key.t3"
+        schema = self.schema_record
+        file_names = [
+            registry.register(key, schema, {"param1": i}).file_name
+            for i in range(12)
+        ]
+        self.assertEqual(len(set(file_names)), 12)
+        self.assertEqual(
+            file_names[-1],
+            os.path.join(self.data_dir, "test", "key", "t3", "data_11.avro")
+        )
+
 
 class TestDataRegistryMarkWritten(BaseTestDataRegistry):
 
     def test_mark_written(self):
-        registry = DataRegistry(self.data_dir)
+        registry = self.lazy_registry()
         key = "test.key.t1"
-        schema = parse(json.dumps({
-            "type": "record",
-            "name": "TestRecord",
-            "fields": [
-                {"name": "field1", "type": "string"},
-                {"name": "field2", "type": "int"}
-            ]
-        }))
+        schema = self.schema_record
         params = {"param1": "value1", "param2": "value2"}
         registered_file_1 = registry.register(key, schema, params)
         expected_registered_file_1 = RegisteredFile(
-            "/tmp/data_cache/test/key/t1/data_0.avro",
+            os.path.join(self.data_dir, "test", "key", "t1", "data_0.avro"),
             False
         )
         self.assertEqual(registered_file_1, expected_registered_file_1)
         registered_file_2 = registry.mark_written(key, registered_file_1.file_name)
         expected_registered_file_2 = RegisteredFile(
-            "/tmp/data_cache/test/key/t1/data_0.avro",
+            os.path.join(self.data_dir, "test", "key", "t1", "data_0.avro"),
             True
         )
         self.assertEqual(registered_file_2, expected_registered_file_2)
 
+class TestDataRegistryBatch(BaseTestDataRegistry):
+
+    def test_batch_defers_writes(self):
+        registry = DataRegistry(self.data_dir)
+        key = "test.key.t1"
+        schema = self.schema_record
+        params = {"param1": "value1", "param2": "value2"}
+        with registry.batch():
+            registered_file = registry.register(key, schema, params)
+            registry.mark_written(key, registered_file.file_name)
+            self.assertNotIn(key, DataRegistry(self.data_dir).registry)
+        reloaded = DataRegistry(self.data_dir)
+        self.assertEqual(
+            reloaded.register(key, schema, params),
+            RegisteredFile(registered_file.file_name, True)
+        )
+        self.assertFalse(os.path.exists(registry.registry_file + ".tmp"))
+
+class TestDataRegistryLazyPersist(BaseTestDataRegistry):
+
+    def test_lazy_registry_writes_on_close(self):
+        key = "test.key.t1"
+        params = {"param1": "value1", "param2": "value2"}
+        with DataRegistry(self.data_dir, persist="lazy") as registry:
+            registered_file = registry.register(
+                key, self.schema_record, params
+            )
+            self.assertNotIn(key, DataRegistry(self.data_dir).registry)
+        reloaded = DataRegistry(self.data_dir)
+        self.assertEqual(
+            reloaded.register(key, self.schema_record, params),
+            registered_file
+        )
+
+    def test_invalid_persist_mode(self):
+        with self.assertRaises(ValueError):
+            DataRegistry(self.data_dir, persist="never")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
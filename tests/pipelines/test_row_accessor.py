@@ -1,6 +1,8 @@
+import importlib.util
 import unittest
 import pandas as pd
 import torch
+from torch.utils.data import DataLoader
 from aconai.pipelines.row_accessor import RowAccessor
 
 class TestRowAccessor(unittest.TestCase):
@@ -16,8 +18,125 @@ class TestRowAccessor(unittest.TestCase):
         features, labels = dataset[1]
         self.assertIsInstance(features, torch.Tensor)
         self.assertIsInstance(labels, torch.Tensor)
-        self.assertTrue(torch.equal(features, torch.tensor([2.0, 5.0])))
-        self.assertTrue(torch.equal(labels, torch.tensor([1])))
+        self.assertTrue(torch.allclose(features, torch.tensor([2.0, 5.0])))
+        self.assertTrue(torch.allclose(labels, torch.tensor([1])))
+
+    def test_row_accessor_data_loader_batch(self):
+        df = pd.DataFrame({
+            "feature1": [1.0, 2.0, 3.0],
+            "feature2": [4.0, 5.0, 6.0],
+            "label": [0, 1, 0],
+        })
+        dataset = RowAccessor(df, labels="label")
+        loader = DataLoader(dataset, batch_size=2)
+
+        features, labels = next(iter(loader))
+        self.assertTrue(torch.allclose(
+            features, torch.tensor([[1.0, 4.0], [2.0, 5.0]])
+        ))
+        self.assertTrue(torch.allclose(labels, torch.tensor([[0], [1]])))
+
+    def test_row_accessor_label_dtype(self):
+        df = pd.DataFrame({
+            "feature1": [1.0, 2.0, 3.0],
+            "label": [0, 1, 0],
+            "target": [0.5, 1.5, 2.5],
+        })
+        self.assertEqual(RowAccessor(df, labels="label")[0][1].dtype,
+                         torch.int64)
+        self.assertEqual(RowAccessor(df, labels="target")[0][1].dtype,
+                         torch.float32)
+        dataset = RowAccessor(df, labels="label", label_dtype=torch.float32)
+        self.assertEqual(dataset[0][1].dtype, torch.float32)
+
+    def test_row_accessor_feature_names(self):
+        df = pd.DataFrame({
+            "feature1": [1.0, 2.0, 3.0],
+            "label": [0, 1, 0],
+            "feature2": [4.0, 5.0, 6.0],
+        })
+        dataset = RowAccessor(df, labels="label")
+
+        self.assertEqual(dataset.feature_names, ["feature1", "feature2"])
+        self.assertEqual(dataset.feature_name_to_idx,
+                         {"feature1": 0, "feature2": 1})
+
+    def test_row_accessor_dtype(self):
+        df = pd.DataFrame({
+            "feature1": [1.0, 2.0, 3.0],
+            "feature2": [4.0, 5.0, 6.0],
+            "label": [0, 1, 0],
+        })
+        dataset = RowAccessor(df, labels="label", dtype=torch.bfloat16)
+
+        features, labels = dataset[1]
+        self.assertEqual(features.dtype, torch.bfloat16)
+        self.assertEqual(labels.dtype, torch.int64)
+        self.assertTrue(torch.allclose(
+            features, torch.tensor([2.0, 5.0], dtype=torch.bfloat16)
+        ))
+        with self.assertRaises(ValueError):
+            RowAccessor(df, labels="label", dtype=torch.int32)
+
+    def test_row_accessor_col_layout(self):
+        df = pd.DataFrame({
+            "feature1": [1.0, 2.0, 3.0],
+            "feature2": [4.0, 5.0, 6.0],
+            "label": [0, 1, 0],
+        })
+        dataset = RowAccessor(df, labels="label", layout="col")
+
+        column = dataset.col("feature2")
+        self.assertTrue(column.is_contiguous())
+        self.assertTrue(torch.allclose(column, torch.tensor([4.0, 5.0, 6.0])))
+        features, _ = dataset[1]
+        self.assertTrue(torch.allclose(features, torch.tensor([2.0, 5.0])))
+        with self.assertRaises(ValueError):
+            RowAccessor(df, labels="label", layout="rows")
+
+    @unittest.skipUnless(importlib.util.find_spec("numba"), "requires numba")
+    def test_row_accessor_map_rows(self):
+        from numba import njit
+
+        @njit
+        def normalize(row):
+            return row / row.sum()
+
+        df = pd.DataFrame({
+            "feature1": [1.0, 2.0, 3.0],
+            "feature2": [4.0, 6.0, 6.0],
+            "label": [0, 1, 0],
+        })
+        dataset = RowAccessor(df, labels="label")
+
+        mapped = dataset.map_rows(normalize, [2, 1])
+        self.assertTrue(torch.allclose(
+            mapped, torch.tensor([[1 / 3, 2 / 3], [0.25, 0.75]])
+        ))
+        self.assertTrue(torch.allclose(
+            dataset.map_rows(normalize, [-1]), torch.tensor([[1 / 3, 2 / 3]])
+        ))
+        with self.assertRaises(IndexError):
+            dataset.map_rows(normalize, [3, 1000000])
+        with self.assertRaises(IndexError):
+            dataset.map_rows(normalize, [-4])
+
+    @unittest.skipUnless(torch.cuda.is_available(), "requires CUDA")
+    def test_row_accessor_pin_memory(self):
+        df = pd.DataFrame({
+            "feature1": [1.0, 2.0, 3.0],
+            "label": [0, 1, 0],
+        })
+        dataset = RowAccessor(df, labels="label", pin_memory=True)
+
+        features, labels = dataset[1]
+        self.assertTrue(features.is_pinned())
+        self.assertTrue(labels.is_pinned())
+        for features, labels in dataset.__getitems__([2, -1, 0]):
+            self.assertTrue(features.is_pinned())
+            self.assertTrue(labels.is_pinned())
+        features, _ = dataset.__getitems__([-1])[0]
+        self.assertTrue(torch.allclose(features, torch.tensor([3.0])))
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file